@@ -2,13 +2,25 @@
 
 import asyncio
 import os
+import signal
 import subprocess
 import time
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from .health import (
+    OPENSCOPE_HOST,
+    OPENSCOPE_PORT,
+    OPENSCOPE_URL,
+    check_service,
+    invalidate_health_cache,
+    probe_timeout,
+    tcp_alive,
+)
+
 agent_router = APIRouter(tags=["agent"])
 
 # Paths
@@ -44,7 +56,7 @@ class AgentStatus(BaseModel):
     mcp_running: bool = False
 
 
-async def start_mcp() -> subprocess.Popen:
+async def start_mcp(client: httpx.AsyncClient) -> subprocess.Popen:
     """Start the MCP server in HTTP mode."""
     global _mcp_proc
 
@@ -67,38 +79,76 @@ async def start_mcp() -> subprocess.Popen:
         cwd=MCP_CWD,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
+        start_new_session=True,
     )
+    return await _wait_for_mcp(client)
 
-    # Wait for MCP to be ready (up to 15 seconds)
-    import httpx
 
-    for _ in range(30):
-        await asyncio.sleep(0.5)
-        try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(f"{MCP_URL}/health", timeout=2.0)
-                if resp.status_code == 200:
-                    return _mcp_proc
-        except Exception:
-            pass
+async def _wait_for_mcp(client: httpx.AsyncClient) -> subprocess.Popen:
+    """Wait for our MCP process to answer its health check, killing it if it never does."""
+    global _mcp_proc
+
+    # Wait for MCP to be ready (up to 15 seconds), backing off from 25ms to 500ms
+    delay = 0.025
+    deadline = time.monotonic() + 15.0
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.5)
+        if await check_service(client, MCP_URL, "/health"):
+            return _mcp_proc
         if _mcp_proc.poll() is not None:
             raise HTTPException(status_code=500, detail="MCP server exited unexpectedly")
 
-    _mcp_proc.kill()
+    _signal_group(_mcp_proc, signal.SIGKILL)
     _mcp_proc.wait()
     _mcp_proc = None
     raise HTTPException(status_code=500, detail="MCP server did not become ready")
 
 
+def _signal_group(proc: subprocess.Popen, sig: int):
+    """Signal the whole process group of proc (uv run plus the real worker)."""
+    try:
+        # Started with start_new_session=True, so the group id is the pid
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _group_alive(proc: subprocess.Popen) -> bool:
+    """Check whether any process is left in the process group of proc."""
+    try:
+        os.killpg(proc.pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists but can't be signalled by us
+    return True
+
+
+def _terminate(procs: list[subprocess.Popen | None], timeout: float = 5.0):
+    """Terminate processes together, sharing one grace period before killing."""
+    alive = [p for p in procs if p and p.poll() is None]
+    for proc in alive:
+        _signal_group(proc, signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    for proc in alive:
+        try:
+            proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            pass
+
+    # uv may exit on SIGTERM while its worker ignores it - give the rest of each
+    # group what is left of the grace period, then kill whatever remains
+    while time.monotonic() < deadline and any(_group_alive(p) for p in alive):
+        time.sleep(0.05)
+    for proc in alive:
+        _signal_group(proc, signal.SIGKILL)
+
+
 def stop_mcp():
     """Stop the MCP server."""
     global _mcp_proc
-    if _mcp_proc and _mcp_proc.poll() is None:
-        _mcp_proc.terminate()
-        try:
-            _mcp_proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            _mcp_proc.kill()
+    _terminate([_mcp_proc])
     _mcp_proc = None
 
 
@@ -142,6 +192,7 @@ def start_agent_subprocess(request: AgentStartRequest) -> tuple[subprocess.Popen
         cwd=AGENT_CWD,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
+        start_new_session=True,
     )
 
     _session_id = session_id
@@ -151,37 +202,53 @@ def start_agent_subprocess(request: AgentStartRequest) -> tuple[subprocess.Popen
 def stop_agent_subprocess():
     """Stop the agent subprocess."""
     global _agent_proc, _session_id
-    if _agent_proc and _agent_proc.poll() is None:
-        _agent_proc.terminate()
-        try:
-            _agent_proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            _agent_proc.kill()
+    _terminate([_agent_proc])
     _agent_proc = None
     _session_id = None
 
 
+def stop_all():
+    """Stop the agent and MCP server, overlapping their shutdown grace periods."""
+    global _mcp_proc, _agent_proc, _session_id
+    _terminate([_agent_proc, _mcp_proc])
+    _agent_proc = None
+    _session_id = None
+    _mcp_proc = None
+
+
 async def cleanup_agent():
     """Cleanup function for application shutdown."""
-    stop_agent_subprocess()
-    stop_mcp()
+    stop_all()
 
 
 @agent_router.post("/agent/start")
-async def start_agent(request: AgentStartRequest):
+async def start_agent(request: AgentStartRequest, http_request: Request):
     """Start the ATC agent."""
     global _mcp_proc, _agent_proc
 
     if _agent_proc and _agent_proc.poll() is None:
         raise HTTPException(status_code=400, detail="Agent already running")
 
-    # Start MCP server if not running
-    if not _mcp_proc or _mcp_proc.poll() is not None:
-        await start_mcp()
-        await asyncio.sleep(1)  # Allow MCP to fully initialize
+    # Probe OpenScope and MCP together; an MCP server that is already up is reused
+    client = http_request.app.state.http
+    openscope_ok, mcp_ok = await asyncio.gather(
+        tcp_alive(OPENSCOPE_HOST, OPENSCOPE_PORT, probe_timeout(OPENSCOPE_URL).connect),
+        check_service(client, MCP_URL, "/health"),
+    )
+    if not openscope_ok:
+        raise HTTPException(status_code=503, detail=f"OpenScope not running at {OPENSCOPE_URL}")
+
+    # Start MCP server if not running; one of ours that is still alive may just be slow
+    if not mcp_ok:
+        if _mcp_proc and _mcp_proc.poll() is None:
+            await _wait_for_mcp(client)
+        else:
+            stop_mcp()  # Clears a process of ours that has exited
+            await start_mcp(client)
 
     # Start agent
     proc, session_id = start_agent_subprocess(request)
+    invalidate_health_cache()
 
     return {"status": "started", "session_id": session_id}
 
@@ -189,8 +256,8 @@ async def start_agent(request: AgentStartRequest):
 @agent_router.post("/agent/stop")
 async def stop_agent():
     """Stop the ATC agent."""
-    stop_agent_subprocess()
-    stop_mcp()
+    stop_all()
+    invalidate_health_cache()
     return {"status": "stopped"}
 
 
@@ -1,10 +1,14 @@
 """Health checks for services."""
 
+import asyncio
 import os
+import time
+from urllib.parse import urlparse
 
 import httpx
-from fastapi import APIRouter
-from fastapi.responses import Response
+from fastapi import APIRouter, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 
 health_router = APIRouter(tags=["health"])
 
@@ -14,57 +18,162 @@ LLM_URL = os.getenv("LLM_URL", "http://localhost:1234/v1")
 VJEPA_URL = os.getenv("VJEPA_URL", "http://localhost:8001")
 MCP_URL = os.getenv("MCP_URL", "http://localhost:8080")
 
+# OpenScope only needs a TCP liveness check - resolve host/port once
+_openscope = urlparse(OPENSCOPE_URL)
+OPENSCOPE_HOST = _openscope.hostname or "localhost"
+OPENSCOPE_PORT = _openscope.port or (443 if _openscope.scheme == "https" else 80)
 
-async def check_service(url: str, path: str = "", timeout: float = 2.0) -> bool:
-    """Check if a service is running."""
+# Probe deadlines - loopback services answer in milliseconds, so fail fast there
+_LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+PROBE_TIMEOUT_LOCAL = httpx.Timeout(connect=0.2, read=0.5, write=0.5, pool=0.5)
+PROBE_TIMEOUT_REMOTE = httpx.Timeout(2.0)
+
+# Cached /health result: (time.monotonic() when probed, response payload)
+HEALTH_CACHE_TTL = 5.0
+_health_cache: tuple[float, dict] | None = None
+
+# Headers relayed between the browser and MCP for conditional screenshot requests
+_SCREENSHOT_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+_SCREENSHOT_CACHE_HEADERS = ("etag", "last-modified", "cache-control")
+
+# HEAD statuses that mean the route exists for GET only (gin/Ollama answer HEAD with 404)
+_HEAD_REFUSED = (404, 405, 501)
+
+# Probe method per URL - HEAD by default, GET from the first time HEAD is refused
+_probe_method: dict[str, str] = {}
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared across requests (see app lifespan)."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(2.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=16,
+            max_connections=32,
+            keepalive_expiry=15.0,
+        ),
+    )
+
+
+def probe_timeout(url: str) -> httpx.Timeout:
+    """Pick the probe timeout for a service URL based on whether it is loopback."""
+    if urlparse(url).hostname in _LOOPBACK_HOSTS:
+        return PROBE_TIMEOUT_LOCAL
+    return PROBE_TIMEOUT_REMOTE
+
+
+async def tcp_alive(host: str, port: int, timeout: float = 0.5) -> bool:
+    """Check if something is accepting TCP connections on host:port."""
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{url}{path}", timeout=timeout)
-            return resp.status_code == 200
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def check_service(
+    client: httpx.AsyncClient,
+    url: str,
+    path: str = "",
+    timeout: httpx.Timeout | float | None = None,
+) -> bool:
+    """Check if a service is running (HEAD, falling back to GET if HEAD is refused)."""
+    target = f"{url}{path}"
+    if timeout is None:
+        timeout = probe_timeout(url)
+    try:
+        method = _probe_method.get(target, "HEAD")
+        resp = await client.request(method, target, timeout=timeout)
+        if method == "HEAD" and resp.status_code in _HEAD_REFUSED:
+            _probe_method[target] = "GET"
+            resp = await client.get(target, timeout=timeout)
+        return resp.status_code == 200
     except (httpx.RequestError, httpx.HTTPStatusError):
         return False
 
 
-async def check_vjepa() -> bool:
+async def check_vjepa(client: httpx.AsyncClient) -> bool:
     """Check V-JEPA health endpoint."""
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{VJEPA_URL}/health", timeout=2.0)
-            if resp.status_code == 200:
-                data = resp.json()
-                return data.get("status") == "healthy"
-            return False
+        resp = await client.get(f"{VJEPA_URL}/health", timeout=probe_timeout(VJEPA_URL))
+        if resp.status_code == 200:
+            data = resp.json()
+            return data.get("status") == "healthy"
+        return False
     except (httpx.RequestError, httpx.HTTPStatusError):
         return False
 
 
+def invalidate_health_cache():
+    """Drop the cached health result so the next request re-probes."""
+    global _health_cache
+    _health_cache = None
+
+
 @health_router.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Check health of all services."""
-    openscope_ok = await check_service(OPENSCOPE_URL)
-    mcp_ok = await check_service(MCP_URL, "/health")
-    llm_ok = await check_service(LLM_URL, "/models")
-    vjepa_ok = await check_vjepa()
+    global _health_cache
+    if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CACHE_TTL:
+        return _health_cache[1]
 
-    return {
+    client = request.app.state.http
+    openscope_ok, mcp_ok, llm_ok, vjepa_ok = await asyncio.gather(
+        tcp_alive(OPENSCOPE_HOST, OPENSCOPE_PORT, probe_timeout(OPENSCOPE_URL).connect),
+        check_service(client, MCP_URL, "/health"),
+        check_service(client, LLM_URL, "/models"),
+        check_vjepa(client),
+    )
+
+    result = {
         "openscope": {"url": OPENSCOPE_URL, "status": "running" if openscope_ok else "offline"},
         "mcp": {"url": MCP_URL, "status": "running" if mcp_ok else "offline"},
         "llm": {"url": LLM_URL, "status": "running" if llm_ok else "offline"},
         "vjepa": {"url": VJEPA_URL, "status": "running" if vjepa_ok else "offline"},
     }
+    _health_cache = (time.monotonic(), result)
+    return result
 
 
 @health_router.get("/screenshot")
-async def get_screenshot():
+async def get_screenshot(request: Request):
     """Proxy screenshot from MCP server."""
+    client = request.app.state.http
+    # Forward conditional headers so an unchanged frame can come back as a 304
+    conditional = {
+        k: v for k, v in request.headers.items() if k in _SCREENSHOT_CONDITIONAL_HEADERS
+    }
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{MCP_URL}/screenshot", timeout=5.0)
-            if resp.status_code == 200:
-                return Response(
-                    content=resp.content,
-                    media_type=resp.headers.get("content-type", "image/png"),
-                )
-            return Response(status_code=resp.status_code, content=b"")
+        req = client.build_request(
+            "GET", f"{MCP_URL}/screenshot", headers=conditional, timeout=5.0
+        )
+        resp = await client.send(req, stream=True)
+        cache_headers = {
+            k: v for k, v in resp.headers.items() if k in _SCREENSHOT_CACHE_HEADERS
+        }
+        if resp.status_code == 200:
+            # Pipe the PNG through without buffering it; close upstream once sent
+            return StreamingResponse(
+                resp.aiter_raw(),
+                media_type=resp.headers.get("content-type", "image/png"),
+                headers={
+                    **cache_headers,
+                    **{
+                        k: v
+                        for k, v in resp.headers.items()
+                        if k in ("content-length", "content-encoding")
+                    },
+                },
+                background=BackgroundTask(resp.aclose),
+            )
+        await resp.aclose()
+        if resp.status_code == 304:
+            return Response(status_code=304, headers=cache_headers)
+        return Response(status_code=resp.status_code, content=b"")
     except (httpx.RequestError, httpx.HTTPStatusError) as e:
         return Response(status_code=503, content=f"MCP unavailable: {e}".encode())
@@ -15,7 +15,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 
 from .agent import agent_router, cleanup_agent
-from .health import health_router
+from .health import create_http_client, health_router
 from .sessions import sessions_router
 
 # Configuration
@@ -25,10 +25,12 @@ FRONTEND_URL = "http://localhost:5173"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan - cleanup on shutdown."""
+    """Application lifespan - shared HTTP client, cleanup on shutdown."""
+    app.state.http = create_http_client()
     yield
     # Cleanup agent subprocess if running
     await cleanup_agent()
+    await app.state.http.aclose()
 
 
 app = FastAPI(
@@ -1,17 +1,81 @@
 """Session management - list sessions and retrieve events for replay."""
 
-import json
+import asyncio
+import contextlib
+import itertools
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
+try:
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional - fall back to the stdlib parser/encoder
+    import json
+    from json import loads as _json_loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional - compressed logs are ignored without it
+    zstandard = None
+
 # Path to agent logs directory
 AGENT_LOGS_DIR = Path(__file__).parent.parent.parent / "openscope-llm-agent" / "logs"
 
 sessions_router = APIRouter(tags=["sessions"])
 
+# Session log suffixes - finished logs may be stored zstd-compressed
+ZST_SUFFIX = ".jsonl.zst"
+_LOG_SUFFIXES = (".jsonl", ZST_SUFFIX) if zstandard else (".jsonl",)
+
+# Byte markers for the metadata events, matching compact and default json.dumps separators
+_START_MARKERS = (b'"event_type":"session_start"', b'"event_type": "session_start"')
+_END_MARKERS = (b'"event_type":"session_end"', b'"event_type": "session_end"')
+
+# Bytes searched at the head/tail of a log for session_start/session_end
+_SCAN_WINDOW = 64 * 1024
+
+# Slice size for counting newlines without copying a whole log at once
+_COUNT_CHUNK = 1024 * 1024
+
+# Parsed metadata per log file name: name -> (st_mtime_ns, st_size, metadata)
+_META_CACHE_MAX = 512
+_META_CACHE: OrderedDict[str, tuple[int, int, "SessionMetadata"]] = OrderedDict()
+_META_CACHE_LOCK = threading.Lock()
+
+# Worker threads for scanning session logs off the event loop
+_POOL = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="sessions"
+)
+
+# Serialized /events bodies: session_id -> (st_mtime_ns, st_size, body), LRU within a byte budget
+_EVENTS_CACHE_BUDGET = 256 * 1024 * 1024
+_EVENTS_CACHE_GRACE_NS = 60 * 1_000_000_000  # logs untouched this long count as finished
+_EVENTS_CACHE: OrderedDict[str, tuple[int, int, bytes]] = OrderedDict()
+_EVENTS_CACHE_LOCK = threading.Lock()
+_events_cache_bytes = 0
+
+# Incremental tail state for live logs: path -> (file id, bytes consumed, events parsed so far)
+# where file id is (st_dev, st_ino), so a log replaced in place is re-read from the start
+_TAIL_CACHE_MAX = 16
+_tail_cache: OrderedDict[Path, tuple[tuple[int, int], int, list[dict]]] = OrderedDict()
+_TAIL_CACHE_LOCK = threading.Lock()
+
 
 class SessionMetadata(BaseModel):
     """Metadata for a session."""
@@ -37,73 +101,365 @@ class SessionEvent(BaseModel):
 
 
 def parse_session_id(filename: str) -> str | None:
-    """Extract session ID from filename like 'events_atc_20260112_222918.jsonl'."""
-    if filename.startswith("events_") and filename.endswith(".jsonl"):
-        return filename[7:-6]  # Remove 'events_' prefix and '.jsonl' suffix
+    """Extract session ID from filename like 'events_atc_20260112_222918.jsonl'.
+
+    '.jsonl.zst' logs are recognized too when zstandard is installed.
+    """
+    if filename[:7] != "events_":
+        return None
+    for suffix in _LOG_SUFFIXES:
+        # Length check also rejects 'events_.jsonl', which has an empty ID
+        if len(filename) > 7 + len(suffix) and filename.endswith(suffix):
+            return filename[7 : -len(suffix)]  # Remove 'events_' prefix and suffix
     return None
 
 
-def load_session_metadata(log_path: Path) -> SessionMetadata | None:
-    """Load metadata from a session log file."""
+def _stat_log(session_id: str) -> tuple[Path, os.stat_result]:
+    """Find a session's log (plain or compressed), raising 404 if there is none."""
+    for suffix in _LOG_SUFFIXES:
+        log_path = AGENT_LOGS_DIR / f"events_{session_id}{suffix}"
+        try:
+            return log_path, log_path.stat()
+        except FileNotFoundError:
+            continue
+    raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+
+
+def _read_zst(log_path: Path) -> bytes:
+    """Decompress a whole zstd-compressed log."""
+    with open(log_path, "rb") as f, zstandard.ZstdDecompressor().stream_reader(f) as reader:
+        return reader.readall()
+
+
+def _try_parse(line: bytes) -> dict | None:
+    """Parse a single JSONL line, returning None if it is not valid JSON."""
+    try:
+        return _json_loads(line)
+    except ValueError:
+        return None
+
+
+def _line_at(mm: bytes | mmap.mmap, pos: int) -> bytes:
+    """Return the line of the buffer that contains byte offset pos."""
+    start = mm.rfind(b"\n", 0, pos) + 1
+    end = mm.find(b"\n", pos)
+    return mm[start : end if end != -1 else len(mm)]
+
+
+def _find_event(
+    mm: bytes | mmap.mmap,
+    markers: tuple[bytes, ...],
+    event_type: str,
+    reverse: bool = False,
+    lo: int = 0,
+    hi: int | None = None,
+) -> dict | None:
+    """Find and parse the first (or last) event of a type by searching for its markers."""
+    if hi is None:
+        hi = len(mm)
+    while True:
+        if reverse:
+            hits = [p for p in (mm.rfind(m, lo, hi) for m in markers) if p != -1]
+        else:
+            hits = [p for p in (mm.find(m, lo, hi) for m in markers) if p != -1]
+        if not hits:
+            return None
+        pos = max(hits) if reverse else min(hits)
+        event = _try_parse(_line_at(mm, pos))
+        if event and event.get("event_type") == event_type:
+            return event
+        # Marker matched inside some other event - keep searching past it
+        if reverse:
+            hi = pos
+        else:
+            lo = pos + 1
+
+
+def _scan_log(buf: bytes | mmap.mmap) -> tuple[int, dict | None, dict | None, bytes]:
+    """Count lines and find the session_start/session_end events of a non-empty log."""
+    # One event per line - count newlines in C, a chunk at a time
+    size = len(buf)
+    count = sum(buf[i : i + _COUNT_CHUNK].count(b"\n") for i in range(0, size, _COUNT_CHUNK))
+    if buf[size - 1] != ord("\n"):
+        count += 1  # Last line has no trailing newline
+
+    # session_start is written first and session_end last, so only search
+    # a window at each end - a live session won't scan its whole log
+    start_event = _find_event(buf, _START_MARKERS, "session_start", hi=min(size, _SCAN_WINDOW))
+    # Widen the tail window to a line start so the last line is searched whole, however long
+    tail = buf.rfind(b"\n", 0, size - _SCAN_WINDOW) + 1 if size > _SCAN_WINDOW else 0
+    end_event = _find_event(buf, _END_MARKERS, "session_end", reverse=True, lo=tail)
+    return count, start_event, end_event, _line_at(buf, 0)
+
+
+def load_session_metadata(
+    log_path: Path, st: os.stat_result | None = None
+) -> SessionMetadata | None:
+    """Load metadata from a session log file, reusing ``st`` if the caller already stat'ed it."""
     session_id = parse_session_id(log_path.name)
     if not session_id:
         return None
+    try:
+        if st is None:
+            st = log_path.stat()
+    except OSError:
+        return None
+
+    # Finished sessions have a sidecar with their metadata - use it while it is fresh
+    sidecar = log_path.parent / f"events_{session_id}.meta.json"
+    try:
+        if sidecar.stat().st_mtime_ns >= st.st_mtime_ns:
+            return SessionMetadata.model_validate_json(sidecar.read_bytes())
+    except (OSError, ValueError):
+        pass  # Missing or unreadable sidecar - fall back to scanning the log
 
-    events = []
     metadata = {"session_id": session_id, "event_count": 0}
 
     try:
-        with open(log_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                    events.append(event)
-                except json.JSONDecodeError:
-                    continue
-
-        metadata["event_count"] = len(events)
+        if log_path.name.endswith(ZST_SUFFIX):
+            data = _read_zst(log_path)
+            if not data:
+                return None
+            count, start_event, end_event, first_line = _scan_log(data)
+        else:
+            if st.st_size == 0:
+                return None
+            with open(log_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    count, start_event, end_event, first_line = _scan_log(mm)
+
+        metadata["event_count"] = count
 
         # Extract metadata from session_start event
-        for event in events:
-            if event.get("event_type") == "session_start":
-                meta = event.get("metadata", {})
-                metadata["model"] = meta.get("model")
-                metadata["timestamp"] = event.get("timestamp", "")
-                break
-
-        # Extract end metrics from session_end event
-        for event in reversed(events):
-            if event.get("event_type") == "session_end":
-                summary = event.get("summary", {})
-                metadata["duration_s"] = event.get("game_time", 0)
-                metadata["score"] = summary.get("game_score")
-                metadata["landings"] = summary.get("arrivals_landed", 0)
-                break
-
-        # Fallback timestamp from first event
-        if not metadata.get("timestamp") and events:
-            metadata["timestamp"] = events[0].get("timestamp", "")
-
-        return SessionMetadata(**metadata)
+        if start_event:
+            meta = start_event.get("metadata", {})
+            metadata["model"] = meta.get("model")
+            metadata["timestamp"] = start_event.get("timestamp", "")
+
+        # Extract end metrics from the last session_end event
+        ended = end_event is not None
+        if ended:
+            summary = end_event.get("summary", {})
+            metadata["duration_s"] = end_event.get("game_time", 0)
+            metadata["score"] = summary.get("game_score")
+            metadata["landings"] = summary.get("arrivals_landed", 0)
+
+        # Fallback timestamp from first event (only parsed when needed)
+        if not metadata.get("timestamp") and first_line:
+            first_event = _try_parse(first_line)
+            if first_event:
+                metadata["timestamp"] = first_event.get("timestamp", "")
+
+        # Validated once per cache fill - a log without a usable timestamp or with
+        # mistyped values is skipped rather than listed
+        session = SessionMetadata(**metadata)
+        if ended:
+            _write_sidecar(sidecar, session)
+        return session
 
     except Exception:
         return None
 
 
+def _write_sidecar(sidecar: Path, metadata: SessionMetadata):
+    """Atomically write the metadata sidecar for a finished session (best effort)."""
+    try:
+        fd, tmp = tempfile.mkstemp(dir=sidecar.parent, prefix=sidecar.name, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(metadata.model_dump_json().encode())
+        os.replace(tmp, sidecar)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+
+
+def cached_session_metadata(
+    log_path: Path, st: os.stat_result | None = None
+) -> SessionMetadata | None:
+    """Load session metadata, reusing the last result while the file is unchanged."""
+    try:
+        if st is None:
+            st = log_path.stat()
+    except OSError:
+        return None  # Removed since the directory was listed
+    with _META_CACHE_LOCK:
+        cached = _META_CACHE.get(log_path.name)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _META_CACHE.move_to_end(log_path.name)
+            return cached[2]
+
+    metadata = load_session_metadata(log_path, st)
+    if metadata:
+        with _META_CACHE_LOCK:
+            _META_CACHE[log_path.name] = (st.st_mtime_ns, st.st_size, metadata)
+            _META_CACHE.move_to_end(log_path.name)
+            while len(_META_CACHE) > _META_CACHE_MAX:
+                _META_CACHE.popitem(last=False)
+    return metadata
+
+
+def _parse_lines(data: bytes, events: list[dict]):
+    """Parse JSONL bytes, appending valid events and skipping bad lines."""
+    # Grow the list once to the line count and fill it by index, walking the
+    # lines with find - no per-append resizes and no list of split lines
+    idx = len(events)
+    events.extend(itertools.repeat(None, data.count(b"\n") + 1))
+    pos, size = 0, len(data)
+    while pos < size:
+        end = data.find(b"\n", pos)
+        if end == -1:
+            end = size
+        if end > pos:
+            try:
+                # Both parsers accept surrounding whitespace, so lines are not stripped
+                events[idx] = _json_loads(data[pos:end])
+                idx += 1
+            except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+                pass
+        pos = end + 1
+    del events[idx:]
+
+
+def read_events(log_path: Path) -> list[dict]:
+    """Read all events from a log, parsing only lines appended since the last call."""
+    if log_path.name.endswith(ZST_SUFFIX):
+        # Compressed logs are finished and can't be tailed - decompress and parse once
+        events: list[dict] = []
+        _parse_lines(_read_zst(log_path), events)
+        return events
+
+    # Take the entry out while parsing so concurrent readers never share a list
+    with _TAIL_CACHE_LOCK:
+        file_id, offset, events = _tail_cache.pop(log_path, (None, 0, []))
+
+    with open(log_path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if file_id != (st.st_dev, st.st_ino) or st.st_size < offset:
+            # File was replaced or truncated - start over
+            offset, events = 0, []
+        f.seek(offset)
+        chunk = f.read()
+
+    # Only consume complete lines; a trailing partial line may still be written
+    end = chunk.rfind(b"\n") + 1
+    _parse_lines(chunk[:end], events)
+    if st.st_mtime_ns < time.time_ns() - _EVENTS_CACHE_GRACE_NS:
+        # Finished log - the events body cache covers repeat reads, so keep no tail state
+        _parse_lines(chunk[end:], events)
+        return events
+
+    with _TAIL_CACHE_LOCK:
+        _tail_cache[log_path] = ((st.st_dev, st.st_ino), offset + end, events)
+        while len(_tail_cache) > _TAIL_CACHE_MAX:
+            _tail_cache.popitem(last=False)
+
+    result = list(events)
+    _parse_lines(chunk[end:], result)
+    return result
+
+
+def iter_ndjson(log_path: Path, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield the complete lines of a log as raw NDJSON bytes, without parsing them."""
+    with open(log_path, "rb") as f:
+        tail = b""
+        while chunk := f.read(chunk_size):
+            chunk = tail + chunk
+            cut = chunk.rfind(b"\n") + 1
+            if cut:
+                yield chunk[:cut]
+            tail = chunk[cut:]
+
+    # A last line without a newline is either still being written or the final
+    # event of a finished log - only pass it on if it is complete JSON
+    if tail and _try_parse(tail) is not None:
+        yield tail + b"\n"
+
+
+def _iter_file(log_path: Path, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield a file's raw bytes in chunks."""
+    with open(log_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _iter_zst(log_path: Path, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield a zstd-compressed log's decompressed bytes in chunks."""
+    with open(log_path, "rb") as f, zstandard.ZstdDecompressor().stream_reader(f) as reader:
+        while chunk := reader.read(chunk_size):
+            yield chunk
+
+
+def _entry_metadata(entry: os.DirEntry) -> SessionMetadata | None:
+    """Load metadata for a scandir entry, stat'ing it once for the cache check and the scan."""
+    try:
+        st = entry.stat()
+    except OSError:
+        return None
+    return cached_session_metadata(Path(entry.path), st)
+
+
+def _cache_events_body(session_id: str, st: os.stat_result, body: bytes):
+    """Store a serialized events body, evicting live sessions before finished ones.
+
+    Must be called with _EVENTS_CACHE_LOCK held.
+    """
+    global _events_cache_bytes
+    old = _EVENTS_CACHE.pop(session_id, None)
+    if old:
+        _events_cache_bytes -= len(old[2])
+    if len(body) > _EVENTS_CACHE_BUDGET:
+        return
+    _EVENTS_CACHE[session_id] = (st.st_mtime_ns, st.st_size, body)
+    _events_cache_bytes += len(body)
+
+    cutoff = time.time_ns() - _EVENTS_CACHE_GRACE_NS
+    for live_only in (True, False):
+        for key in list(_EVENTS_CACHE):
+            if _events_cache_bytes <= _EVENTS_CACHE_BUDGET:
+                return
+            if live_only and _EVENTS_CACHE[key][0] < cutoff:
+                continue
+            _events_cache_bytes -= len(_EVENTS_CACHE.pop(key)[2])
+
+
+def _cached_events_body(session_id: str, st: os.stat_result) -> bytes | None:
+    """Return the cached events body if the log is unchanged since it was serialized."""
+    with _EVENTS_CACHE_LOCK:
+        cached = _EVENTS_CACHE.get(session_id)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _EVENTS_CACHE.move_to_end(session_id)
+            return cached[2]
+    return None
+
+
+def load_events_body(session_id: str, log_path: Path, st: os.stat_result) -> bytes:
+    """Read, serialize and cache the events response body for a session log."""
+    events = read_events(log_path)
+    # Events are trusted log records - serialize them once, skipping jsonable_encoder
+    body = _json_dumps({"session_id": session_id, "events": events, "count": len(events)})
+    with _EVENTS_CACHE_LOCK:
+        _cache_events_body(session_id, st, body)
+    return body
+
+
 @sessions_router.get("/sessions", response_model=list[SessionMetadata])
 async def list_sessions():
     """List all available sessions from the logs directory."""
     if not AGENT_LOGS_DIR.exists():
         return []
 
-    sessions = []
-    for log_file in AGENT_LOGS_DIR.glob("events_*.jsonl"):
-        metadata = load_session_metadata(log_file)
-        if metadata:
-            sessions.append(metadata)
+    # Each log is independent - scan them in parallel without blocking the event loop
+    with os.scandir(AGENT_LOGS_DIR) as it:
+        entries = [e for e in it if parse_session_id(e.name) and e.is_file()]
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(_POOL, _entry_metadata, entry) for entry in entries)
+    )
+    sessions = [metadata for metadata in results if metadata]
 
     # Sort by timestamp descending (newest first)
     sessions.sort(key=lambda s: s.timestamp or "", reverse=True)
@@ -113,11 +469,10 @@ async def list_sessions():
 @sessions_router.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """Get metadata for a specific session."""
-    log_path = AGENT_LOGS_DIR / f"events_{session_id}.jsonl"
-    if not log_path.exists():
-        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    log_path, st = _stat_log(session_id)
 
-    metadata = load_session_metadata(log_path)
+    loop = asyncio.get_running_loop()
+    metadata = await loop.run_in_executor(_POOL, cached_session_metadata, log_path, st)
     if not metadata:
         raise HTTPException(status_code=500, detail="Failed to load session metadata")
 
@@ -125,25 +480,40 @@ async def get_session(session_id: str):
 
 
 @sessions_router.get("/sessions/{session_id}/events")
-async def get_session_events(session_id: str):
-    """Get all events for a session (for replay)."""
-    log_path = AGENT_LOGS_DIR / f"events_{session_id}.jsonl"
-    if not log_path.exists():
-        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
-
-    events = []
-    try:
-        with open(log_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                    events.append(event)
-                except json.JSONDecodeError:
-                    continue
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to read events: {e}")
-
-    return {"session_id": session_id, "events": events, "count": len(events)}
+async def get_session_events(
+    session_id: str, request: Request, format: Literal["json", "ndjson"] = "json"
+):
+    """Get all events for a session (for replay).
+
+    With ``format=ndjson`` the log is streamed as-is (one event per line)
+    instead of being parsed and re-serialized into a JSON object. Compressed
+    logs are passed through still compressed to clients that accept zstd.
+    """
+    log_path, st = _stat_log(session_id)
+
+    if format == "ndjson":
+        if not log_path.name.endswith(ZST_SUFFIX):
+            return StreamingResponse(iter_ndjson(log_path), media_type="application/x-ndjson")
+        if "zstd" in request.headers.get("accept-encoding", ""):
+            return StreamingResponse(
+                _iter_file(log_path),
+                media_type="application/x-ndjson",
+                headers={"Content-Encoding": "zstd", "Vary": "Accept-Encoding"},
+            )
+        return StreamingResponse(
+            _iter_zst(log_path),
+            media_type="application/x-ndjson",
+            headers={"Vary": "Accept-Encoding"},
+        )
+
+    # Unchanged log - replay the body serialized last time
+    body = _cached_events_body(session_id, st)
+    if body is None:
+        # Parsing and serializing a large log is blocking work - keep it off the loop
+        loop = asyncio.get_running_loop()
+        try:
+            body = await loop.run_in_executor(_POOL, load_events_body, session_id, log_path, st)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to read events: {e}")
+
+    return Response(content=body, media_type="application/json")